@@ -1,2 +1,2 @@
 __version__ = "1.0.0"
-__all__ = ['settings', 'handlers', 'ai_service', 'sessions', 'web_server']
+__all__ = ['settings', 'handlers', 'ai_service', 'sessions', 'web_server', 'monitoring', 'offload']
@@ -1,6 +1,7 @@
 import os
 import logging
-from pydantic import BaseModel, ValidationError
+from typing import Literal
+from pydantic import BaseModel, Field, ValidationError
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 
@@ -38,6 +39,14 @@ class Settings(BaseModel):
     CONTENT_MODERATION: bool = True
     SANITIZE_INPUT: bool = True
 
+    # Performance instrumentation
+    LOOP_LAG_INTERVAL: float = Field(0.5, gt=0)         # Seconds between loop lag samples
+    SLOW_CALLBACK_THRESHOLD: float = Field(0.1, gt=0)   # Loop stall (seconds) that triggers a stack dump
+    PROFILE_MAX_SECONDS: int = Field(30, gt=0)          # Upper bound for /debug/profile captures
+    ADMIN_API_TOKEN: str = ""                           # Enables admin HTTP endpoints when set
+    OFFLOAD_EXECUTOR: Literal["thread", "process", "none"] = "thread"
+    OFFLOAD_WORKERS: int = Field(4, gt=0)
+
 
 try:
     # Validate environment variables
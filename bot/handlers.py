@@ -1,7 +1,7 @@
 import re
 import json
+import asyncio
 import logging
-from .knowledge_loader import text_summary
 from telegram import Update
 from telegram.ext import (
     ContextTypes,
@@ -18,10 +18,16 @@ from .sessions import (
     log_security_event,
 )
 from .ai_service import AIService
-from .knowledge_loader import get_knowledge
+from .knowledge_loader import (
+    load_knowledge,
+    store_knowledge,
+    summarize_knowledge,
+    deep_merge,
+)
 
 logger = logging.getLogger(__name__)
 ai_service = AIService()
+knowledge_update_lock = asyncio.Lock()  # Serialises read-merge-write of base.yaml
 
 
 # ──────────────────────────────
@@ -68,7 +74,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # Pre‑defined “quick reply” handlers
 # ──────────────────────────────
 async def handle_cybersecurity(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    knowledge = get_knowledge()
+    knowledge = await load_knowledge()
     cyber = knowledge["courses"]["cybersecurity_training"]
     response = format_message(
         "CYBERSECURITY TRAINING 🔒",
@@ -91,7 +97,7 @@ async def handle_course_fees(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Show tuition / course fee table.
     Looks up `knowledge['courses']` and lists name + price.
     """
-    knowledge = get_knowledge()
+    knowledge = await load_knowledge()
     output_lines = []
     for course_key, course in knowledge["courses"].items():
         price = course.get("price")
@@ -105,7 +111,7 @@ async def handle_certificates(update: Update, context: ContextTypes.DEFAULT_TYPE
     """
     Tell students how to collect certificates.
     """
-    k = get_knowledge()
+    k = await load_knowledge()
     cert = k.get("certificate_info", {})
     content = (
         f"🏢 Pick‑up office: {cert.get('office', 'Registrar')}\n"
@@ -119,7 +125,7 @@ async def handle_masters_programs(update: Update, context: ContextTypes.DEFAULT_
     """
     Describe available master’s programs.
     """
-    k = get_knowledge()
+    k = await load_knowledge()
     masters = k.get("masters_programs", [])
     if not masters:
         await update.message.reply_text(format_message("MASTER’S PROGRAMS", "No programs listed yet."))
@@ -146,7 +152,7 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Send campus location.
     """
-    k = get_knowledge()
+    k = await load_knowledge()
     loc = k.get("location", {})
     google_maps = loc.get("maps_link", "https://maps.app.goo.gl/...")
 
@@ -203,13 +209,13 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # GPT fallback
 # ──────────────────────────────
 async def handle_ai_fallback(update: Update, user_message: str):
-    knowledge = text_summary(get_knowledge())
+    knowledge = await summarize_knowledge(await load_knowledge())
     try:
         response = await ai_service.get_response(user_message, knowledge)
         await update.message.reply_text(format_message("ACT RESPONSE 📌", response))
     except Exception as e:
         logger.error(f"AI Fallback Error: {str(e)}")
-        contacts = get_knowledge()["contacts"]
+        contacts = (await load_knowledge())["contacts"]
         await update.message.reply_text(
             format_message(
                 "SYSTEM ERROR ⚠️",
@@ -218,7 +224,7 @@ async def handle_ai_fallback(update: Update, user_message: str):
         )
 
 async def handle_contact_request(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    knowledge = get_knowledge()
+    knowledge = await load_knowledge()
     contacts = knowledge['contacts']
     response = format_message(
         "CONTACT ACT 📞",
@@ -247,7 +253,7 @@ async def handle_id_verification(
             format_message(
                 "INVALID ID FORMAT ❌",
                 "Correct format: ACT-1234-56\n"
-                f"Contact: {get_knowledge()['contacts']['phone']}",
+                f"Contact: {(await load_knowledge())['contacts']['phone']}",
             )
         )
         log_security_event(user_id, "Invalid ID format attempted")
@@ -258,16 +264,17 @@ async def handle_id_verification(
 # ──────────────────────────────
 async def update_knowledge(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = str(update.effective_user.id)
-    if user_id != config.ADMIN_ID:
-        log_security_event(user_id, "Unauthorized knowledge update attempt")
+    if user_id != settings.ADMIN_ID:
+        await log_security_event(user_id, "Unauthorized knowledge update attempt")
         await update.message.reply_text("❌ Administrator authorization required")
         return
 
     try:
         new_data = json.loads(update.message.text.split(" ", 1)[1])
-        current_knowledge = get_knowledge()
-        updated = current_knowledge.deep_merge(new_data)
-        save_knowledge(updated)
+        async with knowledge_update_lock:
+            current_knowledge = await load_knowledge()
+            updated = deep_merge(current_knowledge, new_data)
+            await store_knowledge(updated)
 
         await update.message.reply_text(
             format_message("KNOWLEDGE UPDATED ✅", f"Updated: {', '.join(new_data.keys())}")
@@ -1,21 +1,49 @@
+import os
+import tempfile
 import yaml
 from pathlib import Path
 
+from .offload import run_blocking
+
+KNOWLEDGE_PATH = Path(__file__).parent.parent/'knowledge'/'base.yaml'
+
 # In knowledge_loader.py
 # Add this ABOVE the existing deep_merge function:
 
 def get_knowledge():
-    with open(Path(__file__).parent.parent/'knowledge'/'base.yaml') as f:
+    with open(KNOWLEDGE_PATH) as f:
         return yaml.safe_load(f)
 
 def save_knowledge(data):
-    with open(Path(__file__).parent.parent/'knowledge'/'base.yaml', 'w') as f:
-        yaml.safe_dump(data, f)
+    """Write to a temp file and swap it in so readers never see a partial file"""
+    path = KNOWLEDGE_PATH
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.stem}.', suffix=path.suffix)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            yaml.safe_dump(data, f)
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 def text_summary(data: dict) -> str:
     """Convert knowledge dict to readable text"""
     return yaml.dump(data, sort_keys=False)
 
+async def load_knowledge() -> dict:
+    """Load the knowledge base without blocking the event loop"""
+    return await run_blocking(get_knowledge)
+
+async def store_knowledge(data: dict) -> None:
+    """Persist the knowledge base without blocking the event loop"""
+    await run_blocking(save_knowledge, data)
+
+async def summarize_knowledge(data: dict) -> str:
+    """Render the knowledge summary without blocking the event loop"""
+    return await run_blocking(text_summary, data)
+
 def deep_merge(target, source):
     for key in source:
         if isinstance(source[key], dict) and isinstance(target.get(key), dict):
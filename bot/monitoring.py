@@ -0,0 +1,190 @@
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter as StackCounter
+from typing import List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prometheus metrics
+LOOP_LAG = Histogram(
+    'event_loop_lag_seconds',
+    'Delay between scheduled and actual wake-up of the event loop sampler',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_LAG_LAST = Gauge('event_loop_lag_last_seconds', 'Most recent event loop lag sample')
+SLOW_CALLBACKS = Counter('event_loop_slow_callbacks_total', 'Event loop stalls longer than the threshold')
+
+
+class LoopMonitor:
+    """Samples event loop lag and logs the stack of callbacks that block it.
+
+    Lag is sampled every LOOP_LAG_INTERVAL seconds. Separately, a
+    heartbeat coroutine ticks several times per SLOW_CALLBACK_THRESHOLD;
+    a watchdog thread logs the loop thread's stack as soon as the
+    heartbeat is older than the threshold, then logs the full stall
+    duration once the loop recovers.
+    """
+
+    def __init__(self, interval: Optional[float] = None, threshold: Optional[float] = None):
+        self.interval = settings.LOOP_LAG_INTERVAL if interval is None else interval
+        self.threshold = settings.SLOW_CALLBACK_THRESHOLD if threshold is None else threshold
+        if self.interval <= 0 or self.threshold <= 0:
+            raise ValueError("interval and threshold must be positive")
+        self._last_tick = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._tasks: List[asyncio.Task] = []
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start the lag sampler on the running loop and the watchdog thread"""
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopped.clear()
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._sample_lag()),
+            loop.create_task(self._heartbeat()),
+        ]
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Loop monitor started (interval={self.interval}s, threshold={self.threshold}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop sampling and join the watchdog thread"""
+        self._stopped.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._watchdog:
+            self._watchdog.join(timeout=self.threshold)
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - start - self.interval, 0.0)
+            LOOP_LAG.observe(lag)
+            LOOP_LAG_LAST.set(lag)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(self.threshold / 4)
+
+    def _watch(self) -> None:
+        stalled_tick = None
+        stalled_in = None
+        while not self._stopped.wait(self.threshold / 4):
+            tick = self._last_tick
+            if stalled_tick is not None and tick != stalled_tick:
+                logger.warning(
+                    f"Event loop stall in {stalled_in} lasted {tick - stalled_tick:.3f}s"
+                )
+                stalled_tick = None
+            stalled = time.monotonic() - tick
+            if stalled > self.threshold and stalled_tick is None:
+                stalled_tick = tick
+                SLOW_CALLBACKS.inc()
+                stalled_in = self._report_stall(stalled)
+
+    def _report_stall(self, stalled: float) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "<unknown>"
+        coroutine = _current_coroutine(frame)
+        stack = traceback.extract_stack(frame)
+        logger.warning(
+            f"Event loop blocked for {stalled:.3f}s (and counting) in {coroutine}\n"
+            + "".join(traceback.format_list(stack))
+        )
+        return coroutine
+
+
+def _current_coroutine(frame) -> str:
+    """Name the innermost coroutine on a frame stack"""
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_COROUTINE:
+            return f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})"
+        frame = frame.f_back
+    return "<non-coroutine callback>"
+
+
+class ProfileInProgress(RuntimeError):
+    """Raised when a profile is requested while another is still running"""
+
+
+_profile_lock = asyncio.Lock()
+
+# Sampling interval bounds (seconds) for sample_profile
+MIN_PROFILE_INTERVAL = 0.001
+MAX_PROFILE_INTERVAL = 1.0
+
+
+def _frame_stack(frame) -> List[str]:
+    """Root-first stack labels, walked via f_back to avoid linecache lookups"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _collect_samples(duration: float, interval: float, stop: threading.Event) -> str:
+    """Sample every thread's stack and return them in collapsed (flamegraph) format"""
+    own_id = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    counts = StackCounter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline and not stop.is_set():
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = _frame_stack(frame)
+            counts[";".join([names.get(thread_id, str(thread_id))] + stack)] += 1
+        stop.wait(interval)
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+async def sample_profile(duration: float, interval: float = 0.005) -> str:
+    """Capture a time-boxed sampling profile of the running process.
+
+    Sampling happens in a dedicated thread so the loop keeps serving
+    requests (and shows up in the profile) while it runs. If the caller
+    is cancelled the sampler is told to stop, and the lock is held until
+    its thread has exited so captures can never overlap.
+    """
+    if _profile_lock.locked():
+        raise ProfileInProgress("A profile is already being captured")
+    async with _profile_lock:
+        duration = min(duration, settings.PROFILE_MAX_SECONDS)
+        interval = min(max(interval, MIN_PROFILE_INTERVAL), MAX_PROFILE_INTERVAL)
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        future = loop.run_in_executor(None, _collect_samples, duration, interval, stop)
+        try:
+            return await asyncio.shield(future)
+        finally:
+            stop.set()
+            while not future.done():
+                try:
+                    await asyncio.wait({future})
+                except asyncio.CancelledError:
+                    pass
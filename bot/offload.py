@@ -0,0 +1,76 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Optional[Executor]:
+    """Lazily build the pool selected by OFFLOAD_EXECUTOR (None means run inline)"""
+    global _executor
+    if _executor is None and settings.OFFLOAD_EXECUTOR != "none":
+        if settings.OFFLOAD_EXECUTOR == "process":
+            # Spawn rather than fork: by now the loop watchdog, Redis client and
+            # default executor threads exist, and forking them can deadlock workers
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.OFFLOAD_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.OFFLOAD_WORKERS,
+                thread_name_prefix="offload",
+            )
+        logger.info(
+            f"Offloading blocking calls to {settings.OFFLOAD_EXECUTOR} pool "
+            f"({settings.OFFLOAD_WORKERS} workers)"
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking CPU/IO call off the event loop.
+
+    With the process pool, ``func`` and its arguments must be picklable,
+    so pass module-level functions rather than lambdas or bound methods.
+    """
+    call = functools.partial(func, *args, **kwargs)
+    executor = get_executor()
+    if executor is None:
+        return call()
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, call)
+    except BrokenExecutor:
+        # A crashed worker poisons the whole pool; rebuild it and retry once
+        logger.warning(f"Offload pool broken, rebuilding it to retry {func!r}")
+        _discard_executor(executor)
+        return await loop.run_in_executor(get_executor(), call)
+
+
+def _discard_executor(executor: Executor) -> None:
+    """Forget a broken pool so the next call builds a fresh one"""
+    global _executor
+    if _executor is executor:
+        _executor = None
+    executor.shutdown(wait=False)
+
+
+def shutdown_executor() -> None:
+    """Stop the offload pool, waiting for queued work to finish"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -2,19 +2,27 @@ from redis.asyncio import Redis
 import json
 from datetime import datetime
 from .config import settings, cipher  # ✅ Correct import
+from .offload import run_blocking
 import logging
 
 logger = logging.getLogger(__name__)
 
 redis = Redis.from_url(settings.REDIS_URL)  # ✅ Uses environment variable
 
+def _decrypt_session(encrypted_data: bytes) -> dict:
+    """Decrypt and decode a stored session (runs in the offload pool)"""
+    return json.loads(cipher.decrypt(encrypted_data).decode())
+
+def _encrypt_session(data: dict) -> bytes:
+    """Encode and encrypt a session (runs in the offload pool)"""
+    return cipher.encrypt(json.dumps(data).encode())
+
 async def get_session(user_id: str) -> dict:
     """Retrieve and decrypt user session"""
     try:
         encrypted_data = await redis.get(f"session:{user_id}")
         if encrypted_data:
-            decrypted = cipher.decrypt(encrypted_data).decode()
-            return json.loads(decrypted)
+            return await run_blocking(_decrypt_session, encrypted_data)
         return {}
     except Exception as e:
         logger.error(f"Session retrieval error: {str(e)}")
@@ -25,7 +33,7 @@ async def update_session(user_id: str, data: dict) -> None:
     try:
         current = await get_session(user_id)
         merged = {**current, **data}
-        encrypted = cipher.encrypt(json.dumps(merged).encode())
+        encrypted = await run_blocking(_encrypt_session, merged)
         
         # ✅ Fixed config→settings and TTL handling
         await redis.setex(
@@ -1,6 +1,16 @@
 from aiohttp import web
 from .config import settings
-from .sessions import redis
+from .sessions import redis, log_security_event
+from .monitoring import (
+    LoopMonitor,
+    ProfileInProgress,
+    sample_profile,
+    MIN_PROFILE_INTERVAL,
+    MAX_PROFILE_INTERVAL,
+)
+from .offload import shutdown_executor
+import asyncio
+import hmac
 import logging
 from prometheus_client import generate_latest, Counter, Histogram
 import time
@@ -55,6 +65,38 @@ async def metrics(request: web.Request) -> web.Response:
         content_type='text/plain'
     )
 
+async def debug_profile(request: web.Request) -> web.Response:
+    """Admin-only sampling profile of the running process (collapsed stacks)"""
+    if not settings.ADMIN_API_TOKEN:
+        return web.Response(status=404)
+
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode(), settings.ADMIN_API_TOKEN.encode()):
+        REQUEST_COUNT.labels('GET', '/debug/profile', 'invalid_token').inc()
+        await log_security_event(request.remote or 'unknown', "Unauthorized profile request")
+        return web.Response(status=403)
+
+    try:
+        seconds = float(request.query.get('seconds', 5))
+        interval = float(request.query.get('interval', 0.005))
+    except ValueError:
+        return web.Response(status=400, text="seconds and interval must be numbers")
+    if not (seconds > 0 and MIN_PROFILE_INTERVAL <= interval <= MAX_PROFILE_INTERVAL):
+        return web.Response(
+            status=400,
+            text=f"seconds must be positive and interval within "
+                 f"[{MIN_PROFILE_INTERVAL}, {MAX_PROFILE_INTERVAL}]",
+        )
+
+    try:
+        profile = await sample_profile(seconds, interval)
+    except ProfileInProgress as e:
+        REQUEST_COUNT.labels('GET', '/debug/profile', 'busy').inc()
+        return web.Response(status=409, text=str(e))
+
+    REQUEST_COUNT.labels('GET', '/debug/profile', 'success').inc()
+    return web.Response(text=profile, content_type='text/plain')
+
 def create_web_app(bot, dispatcher) -> web.Application:
     """Configure web application"""
     app = web.Application()
@@ -64,6 +106,7 @@ def create_web_app(bot, dispatcher) -> web.Application:
     app.router.add_post('/webhook', handle_webhook)
     app.router.add_get('/health', health_check)
     app.router.add_get('/metrics', metrics)
+    app.router.add_get('/debug/profile', debug_profile)
     
     # Add startup/cleanup hooks
     app.on_startup.append(on_startup)
@@ -75,8 +118,14 @@ async def on_startup(app: web.Application) -> None:
     """Startup tasks"""
     logger.info("Web server starting...")
     await redis.ping()  # Test Redis connection
+    app['loop_monitor'] = LoopMonitor()
+    app['loop_monitor'].start()
 
 async def on_cleanup(app: web.Application) -> None:
     """Cleanup tasks"""
+    loop_monitor = app.get('loop_monitor')
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+    await asyncio.to_thread(shutdown_executor)  # Drain offload work without blocking the loop
     logger.info("Closing Redis connections...")
     await redis.close()
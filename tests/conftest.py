@@ -0,0 +1,24 @@
+import os
+
+import pytest
+from cryptography.fernet import Fernet
+
+# bot.config validates the environment at import time
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("ADMIN_ID", "1")
+os.environ.setdefault("WEBHOOK_SECRET", "test-secret")
+os.environ.setdefault("ENCRYPT_KEY", Fernet.generate_key().decode())
+
+
+@pytest.fixture
+def executor_mode(monkeypatch):
+    """Select OFFLOAD_EXECUTOR for a test and tear the pool down afterwards"""
+    from bot import offload
+
+    def set_mode(mode):
+        offload.shutdown_executor()
+        monkeypatch.setattr(offload.settings, "OFFLOAD_EXECUTOR", mode)
+
+    yield set_mode
+    offload.shutdown_executor()
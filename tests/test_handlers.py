@@ -0,0 +1,73 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from bot import handlers, knowledge_loader
+
+
+class FakeMessage:
+    def __init__(self, text):
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text):
+        self.replies.append(text)
+
+
+def fake_update(user_id, text):
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id),
+        message=FakeMessage(text),
+    )
+
+
+@pytest.fixture
+def knowledge_file(tmp_path, monkeypatch):
+    path = tmp_path / 'base.yaml'
+    path.write_text(yaml.safe_dump({"contacts": {"phone": "123"}}))
+    monkeypatch.setattr(knowledge_loader, "KNOWLEDGE_PATH", path)
+    return path
+
+
+def test_concurrent_knowledge_updates_are_merged(knowledge_file, executor_mode, monkeypatch):
+    executor_mode("thread")
+    load_knowledge = handlers.load_knowledge
+
+    async def slow_load_knowledge():
+        # Widen the read-merge-write window so unserialised updates would clobber each other
+        data = await load_knowledge()
+        await asyncio.sleep(0.02)
+        return data
+
+    monkeypatch.setattr(handlers, "load_knowledge", slow_load_knowledge)
+    admin_id = int(handlers.settings.ADMIN_ID)
+    updates = [
+        fake_update(admin_id, "/update_knowledge " + json.dumps({"contacts": {f"extra{i}": i}}))
+        for i in range(5)
+    ]
+
+    async def scenario():
+        await asyncio.gather(*(handlers.update_knowledge(u, None) for u in updates))
+
+    asyncio.run(scenario())
+
+    saved = knowledge_loader.get_knowledge()
+    assert saved["contacts"] == {"phone": "123", **{f"extra{i}": i for i in range(5)}}
+    assert all("KNOWLEDGE UPDATED" in u.message.replies[0] for u in updates)
+
+
+def test_update_knowledge_rejects_non_admin(knowledge_file, monkeypatch):
+    events = []
+
+    async def log_security_event(user_id, event):
+        events.append((user_id, event))
+
+    monkeypatch.setattr(handlers, "log_security_event", log_security_event)
+    update = fake_update(int(handlers.settings.ADMIN_ID) + 1, '/update_knowledge {"x": 1}')
+    asyncio.run(handlers.update_knowledge(update, None))
+
+    assert events and events[0][1] == "Unauthorized knowledge update attempt"
+    assert "x" not in knowledge_loader.get_knowledge()
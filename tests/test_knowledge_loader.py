@@ -0,0 +1,41 @@
+import os
+import stat
+
+import pytest
+import yaml
+
+from bot import knowledge_loader
+
+
+@pytest.fixture
+def knowledge_file(tmp_path, monkeypatch):
+    path = tmp_path / 'base.yaml'
+    path.write_text(yaml.safe_dump({"contacts": {"phone": "123"}}))
+    monkeypatch.setattr(knowledge_loader, "KNOWLEDGE_PATH", path)
+    return path
+
+
+def test_save_knowledge_round_trips(knowledge_file):
+    data = {"contacts": {"phone": "456"}, "courses": {"a": {"price": 10}}}
+    knowledge_loader.save_knowledge(data)
+    assert knowledge_loader.get_knowledge() == data
+    assert os.listdir(knowledge_file.parent) == ['base.yaml']
+
+
+def test_save_knowledge_preserves_mode(knowledge_file):
+    os.chmod(knowledge_file, 0o640)
+    knowledge_loader.save_knowledge({"contacts": {}})
+    assert stat.S_IMODE(knowledge_file.stat().st_mode) == 0o640
+
+
+def test_save_knowledge_failure_leaves_file_untouched(knowledge_file, monkeypatch):
+    def broken_dump(data, stream):
+        stream.write("partial: ")
+        raise yaml.YAMLError("boom")
+
+    monkeypatch.setattr(knowledge_loader.yaml, "safe_dump", broken_dump)
+    with pytest.raises(yaml.YAMLError):
+        knowledge_loader.save_knowledge({"contacts": {}})
+
+    assert knowledge_loader.get_knowledge() == {"contacts": {"phone": "123"}}
+    assert os.listdir(knowledge_file.parent) == ['base.yaml']
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from bot import monitoring
+from bot.monitoring import LoopMonitor, ProfileInProgress, sample_profile
+
+
+def slow_callbacks() -> float:
+    return REGISTRY.get_sample_value('event_loop_slow_callbacks_total') or 0.0
+
+
+async def block_the_loop():
+    time.sleep(0.3)
+
+
+def test_slow_callback_is_reported_with_coroutine(caplog):
+    async def scenario():
+        monitor = LoopMonitor(interval=0.05, threshold=0.05)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.02)
+            await block_the_loop()
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+    before = slow_callbacks()
+    with caplog.at_level(logging.WARNING, logger="bot.monitoring"):
+        asyncio.run(scenario())
+
+    assert slow_callbacks() == before + 1
+    blocked = [r.getMessage() for r in caplog.records if "blocked for" in r.getMessage()]
+    assert len(blocked) == 1
+    assert "block_the_loop" in blocked[0]
+    assert any("lasted" in r.getMessage() for r in caplog.records)
+
+
+def test_cancelled_profile_holds_lock_until_sampler_exits(monkeypatch):
+    release = threading.Event()
+    sampler_done = threading.Event()
+
+    def slow_exit_sampler(duration, interval, stop):
+        release.wait()  # Ignores stop to simulate a sampler that is slow to exit
+        sampler_done.set()
+        return ""
+
+    monkeypatch.setattr(monitoring, "_collect_samples", slow_exit_sampler)
+
+    async def scenario():
+        first = asyncio.ensure_future(sample_profile(5))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0.05)
+        with pytest.raises(ProfileInProgress):
+            await sample_profile(0.1)
+        assert not sampler_done.is_set()
+
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert sampler_done.is_set()
+        assert not monitoring._profile_lock.locked()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_profile_stops_sampler():
+    async def scenario():
+        first = asyncio.ensure_future(sample_profile(5, interval=0.01))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert time.monotonic() - started < 1
+        return await sample_profile(0.05, interval=0.01)
+
+    assert "MainThread;" in asyncio.run(scenario())
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import BrokenExecutor
+
+import pytest
+
+from bot import offload
+
+
+def test_run_blocking_thread(executor_mode):
+    executor_mode("thread")
+    thread = asyncio.run(offload.run_blocking(threading.current_thread))
+    assert thread.name.startswith("offload")
+
+
+def test_run_blocking_process(executor_mode):
+    executor_mode("process")
+    pid = asyncio.run(offload.run_blocking(os.getpid))
+    assert pid != os.getpid()
+    assert asyncio.run(offload.run_blocking(pow, 2, 10)) == 1024
+
+
+def test_process_pool_uses_spawn(executor_mode):
+    executor_mode("process")
+    assert offload.get_executor()._mp_context.get_start_method() == "spawn"
+
+
+def test_broken_process_pool_is_rebuilt(executor_mode):
+    executor_mode("process")
+
+    async def scenario():
+        with pytest.raises(BrokenExecutor):
+            await offload.run_blocking(os._exit, 1)
+        return await offload.run_blocking(pow, 2, 3)
+
+    assert asyncio.run(scenario()) == 8
+
+
+def test_run_blocking_inline(executor_mode):
+    executor_mode("none")
+    thread = asyncio.run(offload.run_blocking(threading.current_thread))
+    assert thread is threading.main_thread()
+    assert offload.get_executor() is None
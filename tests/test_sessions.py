@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from bot import sessions
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.mark.parametrize("mode", ["thread", "process", "none"])
+def test_session_round_trip(mode, executor_mode, monkeypatch):
+    executor_mode(mode)
+    redis = FakeRedis()
+    monkeypatch.setattr(sessions, "redis", redis)
+
+    async def scenario():
+        await sessions.update_session("42", {"student_id": "ACT-1234-56"})
+        await sessions.update_session("42", {"id_verified": True})
+        return await sessions.get_session("42")
+
+    assert asyncio.run(scenario()) == {"student_id": "ACT-1234-56", "id_verified": True}
+    stored = redis.store["session:42"]
+    assert b"ACT-1234-56" not in stored
+    assert sessions._decrypt_session(stored)["id_verified"] is True
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot import monitoring, web_server
+
+
+@pytest.fixture(autouse=True)
+def no_security_log(monkeypatch):
+    async def log_security_event(user_id, event):
+        pass
+
+    monkeypatch.setattr(web_server, "log_security_event", log_security_event)
+
+
+def profile_request(path, headers=None, hold_lock=False):
+    """Issue a GET against an app exposing only /debug/profile"""
+    async def scenario():
+        app = web.Application()
+        app.router.add_get('/debug/profile', web_server.debug_profile)
+        async with TestClient(TestServer(app)) as client:
+            if hold_lock:
+                async with monitoring._profile_lock:
+                    response = await client.get(path, headers=headers or {})
+            else:
+                response = await client.get(path, headers=headers or {})
+            return response.status, await response.text()
+
+    return asyncio.run(scenario())
+
+
+def test_profile_disabled_without_token(monkeypatch):
+    monkeypatch.setattr(web_server.settings, "ADMIN_API_TOKEN", "")
+    status, _ = profile_request('/debug/profile', {'X-Admin-Token': ''})
+    assert status == 404
+
+
+@pytest.mark.parametrize("token", ["wrong", "non-ascii-é", ""])
+def test_profile_rejects_bad_token(monkeypatch, token):
+    monkeypatch.setattr(web_server.settings, "ADMIN_API_TOKEN", "secret")
+    status, _ = profile_request('/debug/profile', {'X-Admin-Token': token})
+    assert status == 403
+
+
+@pytest.mark.parametrize("query", [
+    "seconds=abc",
+    "seconds=0",
+    "seconds=-1",
+    "interval=0",
+    "interval=1e-9",
+    "interval=5",
+])
+def test_profile_rejects_bad_params(monkeypatch, query):
+    monkeypatch.setattr(web_server.settings, "ADMIN_API_TOKEN", "secret")
+    status, _ = profile_request(f'/debug/profile?{query}', {'X-Admin-Token': 'secret'})
+    assert status == 400
+
+
+def test_profile_conflict_while_running(monkeypatch):
+    monkeypatch.setattr(web_server.settings, "ADMIN_API_TOKEN", "secret")
+    status, _ = profile_request(
+        '/debug/profile?seconds=0.1', {'X-Admin-Token': 'secret'}, hold_lock=True
+    )
+    assert status == 409
+
+
+def test_profile_returns_collapsed_stacks(monkeypatch):
+    monkeypatch.setattr(web_server.settings, "ADMIN_API_TOKEN", "secret")
+    status, body = profile_request(
+        '/debug/profile?seconds=0.1&interval=0.01', {'X-Admin-Token': 'secret'}
+    )
+    assert status == 200
+    assert "MainThread;" in body
+
+
+def test_profile_other_runtime_errors_are_not_busy(monkeypatch):
+    monkeypatch.setattr(web_server.settings, "ADMIN_API_TOKEN", "secret")
+
+    async def sample_profile(seconds, interval):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(web_server, "sample_profile", sample_profile)
+    status, _ = profile_request('/debug/profile', {'X-Admin-Token': 'secret'})
+    assert status == 500
+
+
+def test_cleanup_drains_executor_off_the_loop(monkeypatch):
+    loop_threads = []
+
+    def shutdown_executor():
+        loop_threads.append(threading.get_ident())
+
+    async def close():
+        pass
+
+    monkeypatch.setattr(web_server, "shutdown_executor", shutdown_executor)
+    monkeypatch.setattr(web_server.redis, "close", close)
+
+    async def scenario():
+        await web_server.on_cleanup(web.Application())
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert loop_threads and loop_threads[0] != loop_thread